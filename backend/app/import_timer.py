@@ -0,0 +1,99 @@
+import sys
+import time
+import threading
+from collections import defaultdict
+from typing import Dict, Any, List
+
+# Imported first thing in app/main.py, so this is the start of the app's boot
+# (only the ASGI server's own imports happen earlier).
+BOOT_STARTED = time.perf_counter()
+
+
+class ImportTimer:
+    """
+    sys.meta_path finder that times every module executed after install().
+    Like `python -X importtime`, each module gets a cumulative time and a
+    self time (cumulative minus the nested imports it triggered), so shared
+    dependencies are charged to themselves rather than to whoever imported
+    them first.
+    """
+
+    def __init__(self):
+        self.self_ms: Dict[str, float] = {}
+        self.cumulative_ms: Dict[str, float] = {}
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        loader = spec.loader
+        # Builtin/frozen importers are classes shared by every module; only
+        # per-module loader instances can be wrapped safely.
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            loader.exec_module = self._timed(fullname, loader.exec_module)
+        return spec
+
+    def _timed(self, fullname, exec_module):
+        def exec_module_timed(module):
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0.0)  # time spent in nested imports
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.cumulative_ms[fullname] = round(elapsed, 2)
+                self.self_ms[fullname] = round(elapsed - nested, 2)
+        return exec_module_timed
+
+    def report(self, limit: int = 25) -> Dict[str, Any]:
+        # Snapshots: an import on another thread may still be writing
+        self_ms = dict(self.self_ms)
+        cumulative_ms = dict(self.cumulative_ms)
+        by_package: Dict[str, float] = defaultdict(float)
+        for name, ms in self_ms.items():
+            by_package[name.split(".")[0]] += ms
+        slowest: List[str] = sorted(self_ms, key=self_ms.get, reverse=True)[:limit]
+        return {
+            "total_ms": round(sum(self_ms.values()), 2),
+            "by_package_ms": {
+                name: round(ms, 2)
+                for name, ms in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+            },
+            "app_modules": {
+                name: {"self_ms": self_ms[name], "cumulative_ms": cumulative_ms[name]}
+                for name in sorted(self_ms) if name == "app" or name.startswith("app.")
+            },
+            "slowest_modules": {
+                name: {"self_ms": self_ms[name], "cumulative_ms": cumulative_ms[name]}
+                for name in slowest
+            },
+        }
+
+
+import_timer = ImportTimer()
+
+def install():
+    if import_timer not in sys.meta_path:
+        sys.meta_path.insert(0, import_timer)
+
+def uninstall():
+    """Called once the replica is warm; later imports are no longer timed."""
+    if import_timer in sys.meta_path:
+        sys.meta_path.remove(import_timer)
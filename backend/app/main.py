@@ -1,11 +1,19 @@
+# Installed before anything else is imported so every module's import time
+# (fastapi, sqlalchemy, motor, ...) is recorded; see /health/ready.
+from app import import_timer
+import_timer.install()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import hybrid, analytics, recommendation, evolution
+from app.startup import lifespan
+from app.services.profiler import ProfilingMiddleware
+from app.routers import hybrid, analytics, recommendation, evolution, profiling, health
 
 app = FastAPI(
     title="BioOF Hybrid Query Engine",
     description="Optimization-Centric Database System MVP",
-    version="0.4.0"
+    version="0.4.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -23,10 +31,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (no-op unless armed via /api/admin/profiling)
+app.add_middleware(ProfilingMiddleware)
+
 app.include_router(hybrid.router, prefix="/api", tags=["Hybrid Queries"])
 app.include_router(analytics.router, prefix="/api", tags=["OLAP Analytics"])
 app.include_router(recommendation.router, prefix="/api", tags=["Vector Search"])
 app.include_router(evolution.router, prefix="/api", tags=["Schema Evolution"])
+app.include_router(profiling.router, prefix="/api", tags=["Profiling"])
+app.include_router(health.router, tags=["Health"])
 
 @app.get("/")
 def read_root():
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.database import get_db, get_mongo_db
+from app.services.schema_registry import schema_registry
 from pydantic import BaseModel
 from typing import Optional
 
@@ -62,8 +63,7 @@ async def evolve_schema(
     )
     
     # 4. Fetch Updated Schema for Frontend Return
-    result = await db.execute(text("SELECT attribute_name, default_value FROM schema_evolution_log ORDER BY created_at ASC"))
-    current_schema =  [{"name": row[0], "default": row[1]} for row in result.fetchall()]
+    current_schema = await schema_registry.load(db)
 
     return {
         "message": f"Schema Evolved: Added '{request.attribute_name}'",
@@ -74,6 +74,5 @@ async def evolve_schema(
 
 @router.get("/schema/active")
 async def get_active_schema(db: AsyncSession = Depends(get_db)):
-    """Fetches the current dynamic schema definition from SQL."""
-    result = await db.execute(text("SELECT attribute_name, default_value FROM schema_evolution_log ORDER BY created_at ASC"))
-    return [{"name": row[0], "default": row[1]} for row in result.fetchall()]
+    """Fetches the current dynamic schema definition (cached registry, backed by SQL)."""
+    return await schema_registry.get(db)
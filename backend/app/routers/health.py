@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.startup import state, recheck_indexes
+
+router = APIRouter()
+
+@router.get("/health/live")
+async def liveness():
+    """The process is up and serving; says nothing about its dependencies."""
+    return {"status": "alive"}
+
+@router.get("/health/ready")
+async def readiness():
+    """503 until clients are connected and hot caches are warm."""
+    await recheck_indexes()
+    return JSONResponse(
+        status_code=200 if state.ready else 503,
+        content={"status": "ready" if state.ready else "warming_up", **state.report()},
+    )
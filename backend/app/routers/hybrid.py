@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db, get_mongo_db
+from app.database import get_db, get_mongo_db, get_redis
 from app.models.sql import Project, Experiment
 from app.models.nosql import GeneData
+from app.services.cache_service import CacheService
 from typing import List, Dict, Any
+from bson import ObjectId
 
 router = APIRouter()
 
@@ -83,10 +85,6 @@ async def hybrid_query(
         }
     }
 
-from app.database import get_db, get_mongo_db, get_redis
-from app.services.cache_service import CacheService
-from bson import ObjectId
-
 @router.get("/gene/{gene_id}")
 async def get_gene_detail(
     gene_id: str,
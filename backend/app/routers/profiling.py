@@ -0,0 +1,63 @@
+import secrets
+from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Optional
+from app.services.profiler import profiler, Mode, PROFILER_TOKEN
+
+router = APIRouter()
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Profiling is invisible unless PROFILER_TOKEN is configured."""
+    if not PROFILER_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest((x_admin_token or "").encode(), PROFILER_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+class ArmRequest(BaseModel):
+    # Path prefix; "" or "/" would match every request, /health probes included
+    route: str = Field(..., min_length=2, pattern="^/")
+    mode: Mode = "deterministic"
+    requests: Optional[int] = Field(None, gt=0)
+    duration_s: Optional[float] = Field(None, gt=0)
+    interval_ms: float = Field(5.0, ge=1)
+
+@router.post("/admin/profiling", dependencies=[Depends(require_admin)])
+async def arm_profiler(request: ArmRequest):
+    """
+    Arms the request profiler:
+    - `requests`: profile the next N requests whose path starts with `route`.
+    - `duration_s`: profile every matching request within the window.
+    - `mode`: 'deterministic' (exact per-request stacks) or 'sampling'.
+    """
+    try:
+        profiler.arm(
+            request.route,
+            mode=request.mode,
+            requests=request.requests,
+            duration_s=request.duration_s,
+            interval_ms=request.interval_ms,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return profiler.status()
+
+@router.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def get_profile(limit: int = 25):
+    """Session status plus the top-function table."""
+    return {
+        "status": profiler.status(),
+        "top_functions": profiler.top_functions(limit),
+    }
+
+@router.get("/admin/profiling/collapsed", dependencies=[Depends(require_admin)], response_class=PlainTextResponse)
+async def get_collapsed_stacks():
+    """Collapsed stacks for flamegraph.pl, speedscope or inferno."""
+    return profiler.collapsed()
+
+@router.delete("/admin/profiling", dependencies=[Depends(require_admin)])
+async def disarm_profiler():
+    profiler.disarm()
+    return profiler.status()
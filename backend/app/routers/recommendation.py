@@ -4,6 +4,7 @@ from sqlalchemy import text
 from app.database import get_db, get_mongo_db
 from app.models.sql import Experiment
 from typing import List, Dict, Any
+from bson import ObjectId
 
 router = APIRouter()
 
@@ -24,7 +25,6 @@ async def recommend_similar_genes(
     # It has 'gene_symbol'. Let's fetch the Symbol from Mongo first if ID is passed.
     
     try:
-        from bson import ObjectId
         mongo_gene = await mongo_db.gene_data.find_one({"_id": ObjectId(gene_id)})
         if not mongo_gene:
             raise HTTPException(status_code=404, detail="Gene source not found")
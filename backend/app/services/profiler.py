@@ -0,0 +1,320 @@
+import os
+import sys
+import dis
+import inspect
+import time
+import threading
+import contextvars
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Tuple, Literal
+
+# Admin token guarding the /admin/profiling endpoints. Profiling is disabled
+# entirely (endpoints return 404) when this is not set.
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN")
+
+Mode = Literal["deterministic", "sampling"]
+
+# Marks the coroutines/frames that belong to a request being profiled, so the
+# deterministic hook ignores other requests interleaved on the event loop.
+_profiling_request = contextvars.ContextVar("profiling_request", default=False)
+
+
+# Keyed by plain values rather than code objects so the cache never keeps code
+# (and the modules/closures it references) alive; cleared per session.
+_labels: Dict[Tuple[str, int, str], str] = {}
+
+_GENERATOR_FLAGS = inspect.CO_GENERATOR | inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR
+_RESUME = dis.opmap.get("RESUME")
+
+
+def _label(code) -> str:
+    key = (code.co_filename, code.co_firstlineno, code.co_name)
+    label = _labels.get(key)
+    if label is None:
+        label = _labels[key] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def _is_first_entry(frame) -> bool:
+    """False when a 'call' event is a suspended generator/coroutine resuming."""
+    if not frame.f_code.co_flags & _GENERATOR_FLAGS:
+        return True
+    if _RESUME is None:  # < 3.11: f_lasti is -1 until the frame first runs
+        return frame.f_lasti < 0
+    # 3.11+: the event fires on a RESUME instruction whose oparg is 0 only at function start
+    code, i = frame.f_code.co_code, frame.f_lasti
+    return code[i] != _RESUME or code[i + 1] == 0
+
+
+def _is_idle(frame) -> bool:
+    """The event loop blocked in its selector, waiting for I/O."""
+    code = frame.f_code
+    return code.co_name in ("select", "poll", "control") and os.path.basename(code.co_filename) == "selectors.py"
+
+
+def _builtin_label(func) -> str:
+    # Keyed by name, not by the bound method: d1.get and d2.get are one function
+    # and holding the method object would keep its __self__ alive.
+    return f"{getattr(func, '__qualname__', type(func).__qualname__)} (builtin)"
+
+
+def _stack(frame) -> Tuple[str, ...]:
+    """Walks a frame chain into a root-first tuple of function labels."""
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class RequestProfiler:
+    """
+    Opt-in request profiler:
+    - Armed for the next N requests whose path starts with `route`, or for
+      every matching request within a time window.
+    - 'deterministic' mode hooks sys.setprofile on the event loop thread and
+      charges wall time to the exact stack of the profiled request. The
+      hook's own bookkeeping is excluded, but CPython's cost of invoking it
+      is not, so call-heavy code (many tiny builtin calls) reads high.
+    - 'sampling' mode polls the event loop thread's stack every interval_ms.
+      It cannot tell requests apart, so it sees all CPU work done while a
+      profiled request is in flight. Samples taken while the loop is idle in
+      its selector are counted separately (`idle_samples`), not as stacks.
+    The modes measure different things: deterministic weights are wall time
+    (us) the request's own code ran, sampling weights are samples of whatever
+    the event loop was executing.
+    When disarmed the middleware only reads `self.armed` (a single bool).
+    """
+
+    def __init__(self):
+        self.armed = False
+        self._lock = threading.Lock()
+        self._reset_session()
+
+    def _reset_session(self):
+        self.route: Optional[str] = None
+        self.mode = "deterministic"
+        self.remaining: Optional[int] = None
+        self.deadline: Optional[float] = None
+        self.interval = 0.005
+        self.profiled_requests = 0
+        self._in_flight = 0
+        # stack (tuple of function labels) -> weight
+        # (microseconds for deterministic, sample count for sampling)
+        self._stacks: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._calls: Dict[str, int] = defaultdict(int)
+        self.idle_samples = 0
+        self._last_stack: Optional[Tuple] = None
+        self._last_time = 0.0
+        # Shadow of the event loop thread's call stack: (frame, labels root-first)
+        self._shadow: List[Tuple[Any, Tuple[str, ...]]] = []
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_stop = threading.Event()
+
+    # ---- Arming ----
+
+    def arm(
+        self,
+        route: str,
+        mode: Mode = "deterministic",
+        requests: Optional[int] = None,
+        duration_s: Optional[float] = None,
+        interval_ms: float = 5.0,
+    ):
+        """Starts a new session, discarding any previous results."""
+        if requests is None and duration_s is None:
+            raise ValueError("Either 'requests' or 'duration_s' is required")
+        if interval_ms < 1:
+            # Anything lower turns the sampler into a busy loop fighting the event loop for the GIL
+            raise ValueError("'interval_ms' must be at least 1")
+        with self._lock:
+            if self._in_flight:
+                raise RuntimeError("A profiled request is still in flight")
+            self._reset_session()
+            _labels.clear()
+            self.route = route
+            self.mode = mode
+            self.remaining = requests
+            self.deadline = time.monotonic() + duration_s if duration_s is not None else None
+            self.interval = interval_ms / 1000.0
+            self.armed = True
+
+    def disarm(self):
+        with self._lock:
+            self.armed = False
+
+    def _claim(self, path: str) -> bool:
+        """Decides whether this request is profiled, consuming one slot of N."""
+        if not path.startswith(self.route):
+            return False
+        with self._lock:
+            if not self.armed:
+                return False
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                self.armed = False
+                return False
+            if self.remaining is not None:
+                if self.remaining <= 0:
+                    self.armed = False
+                    return False
+                self.remaining -= 1
+                if self.remaining == 0:
+                    self.armed = False
+            self.profiled_requests += 1
+            self._in_flight += 1
+            if self._in_flight == 1:
+                self._start()
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._stop()
+
+    # ---- Collectors ----
+
+    def _start(self):
+        self._loop_thread_id = threading.get_ident()
+        if self.mode == "deterministic":
+            self._last_stack = None
+            self._shadow = []
+            self._last_time = time.perf_counter()
+            sys.setprofile(self._hook)
+        else:
+            self._sampler_stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler.start()
+
+    def _stop(self):
+        if self.mode == "deterministic":
+            sys.setprofile(None)
+            self._charge(time.perf_counter())
+            self._shadow = []
+        else:
+            self._sampler_stop.set()
+            self._sampler.join()
+
+    def _charge(self, now: float):
+        if self._last_stack is not None:
+            self._stacks[self._last_stack] += (now - self._last_time) * 1e6
+        self._last_time = now
+
+    def _stack_of(self, frame) -> Tuple[str, ...]:
+        """Labels for `frame`'s stack, resyncing the shadow stack if it drifted."""
+        shadow = self._shadow
+        if frame is None:
+            shadow.clear()
+            return ()
+        if not shadow or shadow[-1][0] is not frame:
+            # First event of the session, or events we never saw (e.g. the
+            # frames that installed the hook): rebuild once from the frames.
+            shadow[:] = [(frame, _stack(frame))]
+        return shadow[-1][1]
+
+    def _hook(self, frame, event, arg):
+        self._charge(time.perf_counter())
+        # The shadow stack follows every event so it stays nested correctly,
+        # but only events in the profiled request's context are charged.
+        in_request = _profiling_request.get()
+        if event == "call":
+            stack = self._stack_of(frame.f_back) + (_label(frame.f_code),)
+            self._shadow.append((frame, stack))
+            if in_request and _is_first_entry(frame):
+                self._calls[stack[-1]] += 1
+        elif event == "return":
+            self._stack_of(frame)
+            self._shadow.pop()
+            stack = self._stack_of(frame.f_back)
+        elif event == "c_call":
+            label = _builtin_label(arg)
+            stack = self._stack_of(frame) + (label,)
+            if in_request:
+                self._calls[label] += 1
+        else:  # c_return / c_exception
+            stack = self._stack_of(frame)
+        self._last_stack = stack if in_request and stack else None
+        # Restart the clock after our own bookkeeping so it isn't charged to the request
+        self._last_time = time.perf_counter()
+
+    def _sample_loop(self):
+        while not self._sampler_stop.wait(self.interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            if _is_idle(frame):
+                self.idle_samples += 1
+            else:
+                self._stacks[_stack(frame)] += 1
+
+    # ---- Reporting ----
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format, consumable by flamegraph.pl / speedscope."""
+        folded: Dict[str, float] = defaultdict(float)
+        for stack, weight in list(self._stacks.items()):
+            folded[";".join(name.replace(";", ":") for name in stack)] += weight
+        lines = [f"{names} {int(weight)}" for names, weight in sorted(folded.items()) if weight >= 1]
+        return "\n".join(lines) + "\n"
+
+    def top_functions(self, limit: int = 25) -> List[Dict[str, Any]]:
+        self_weight: Dict[str, float] = defaultdict(float)
+        total_weight: Dict[str, float] = defaultdict(float)
+        for stack, weight in list(self._stacks.items()):
+            self_weight[stack[-1]] += weight
+            for entry in set(stack):
+                total_weight[entry] += weight
+
+        unit = "us" if self.mode == "deterministic" else "samples"
+        rows = [
+            {
+                "function": entry,
+                f"self_{unit}": round(self_weight.get(entry, 0.0)),
+                f"total_{unit}": round(total),
+                "calls": self._calls.get(entry) if self.mode == "deterministic" else None,
+            }
+            for entry, total in total_weight.items()
+        ]
+        rows.sort(key=lambda r: r[f"self_{unit}"], reverse=True)
+        return rows[:limit]
+
+    def status(self) -> Dict[str, Any]:
+        if self.armed and self.deadline is not None and time.monotonic() > self.deadline:
+            self.disarm()
+        return {
+            "armed": self.armed,
+            "route": self.route,
+            "mode": self.mode,
+            "remaining_requests": self.remaining,
+            "seconds_left": max(0.0, round(self.deadline - time.monotonic(), 1)) if self.deadline else None,
+            "profiled_requests": self.profiled_requests,
+            "idle_samples": self.idle_samples if self.mode == "sampling" else None,
+            "in_flight": self._in_flight,
+        }
+
+
+profiler = RequestProfiler()
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; a no-op pass-through unless the profiler is armed."""
+
+    def __init__(self, app, profiler: RequestProfiler = profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if not self.profiler.armed or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if not self.profiler._claim(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        token = _profiling_request.set(True)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _profiling_request.reset(token)
+            self.profiler._release()
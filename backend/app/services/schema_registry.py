@@ -0,0 +1,28 @@
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List, Dict
+
+class SchemaRegistry:
+    """
+    In-process cache of the dynamic schema ('schema_evolution_log').
+    Warmed at startup and refreshed locally on evolve; the TTL bounds how
+    stale a replica can be after another replica evolves the schema.
+    """
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._schema: Optional[List[Dict[str, str]]] = None
+        self._loaded_at = 0.0
+
+    async def load(self, db: AsyncSession) -> List[Dict[str, str]]:
+        result = await db.execute(text("SELECT attribute_name, default_value FROM schema_evolution_log ORDER BY created_at ASC"))
+        self._schema = [{"name": row[0], "default": row[1]} for row in result.fetchall()]
+        self._loaded_at = time.monotonic()
+        return self._schema
+
+    async def get(self, db: AsyncSession) -> List[Dict[str, str]]:
+        if self._schema is None or time.monotonic() - self._loaded_at > self.ttl:
+            return await self.load(db)
+        return self._schema
+
+schema_registry = SchemaRegistry()
@@ -0,0 +1,153 @@
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from sqlalchemy import text
+from typing import Dict, Any, List
+
+from app.database import (
+    init_clients, close_clients, get_engine, get_session_factory,
+    get_mongo_client, get_redis_client,
+)
+from app.services.schema_registry import schema_registry
+from app.import_timer import import_timer, BOOT_STARTED, uninstall as uninstall_import_timer
+
+# Number of PostgreSQL pool connections opened before the replica reports ready
+PREWARM_CONNECTIONS = int(os.getenv("PREWARM_CONNECTIONS", "3"))
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "2"))
+# While indexes are reported missing (e.g. the seeder hasn't created them yet),
+# /health/ready re-checks them at most this often
+INDEX_RECHECK_SECONDS = float(os.getenv("INDEX_RECHECK_SECONDS", "30"))
+
+# Indexes the hot query paths rely on (see database/init.sql and database/seeder.py)
+EXPECTED_MONGO_INDEXES = {
+    "gene_data": [[("expression_score", -1)], [("experiment_id", 1)]],
+}
+EXPECTED_SQL_INDEXES = ["idx_experiments_project", "idx_gene_embedding"]
+
+
+class StartupState:
+    """Boot timings and the liveness/readiness flags served by /health."""
+    def __init__(self):
+        self.phase_ms: Dict[str, float] = {}
+        self.index_warnings: List[str] = []
+        self.index_checked_at = 0.0
+        self.ready = False
+        self.last_error = None
+        self.warmup_attempts = 0
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warmup_attempts": self.warmup_attempts,
+            "last_error": self.last_error,
+            "imports": import_timer.report(),
+            "phase_ms": self.phase_ms,
+            "index_warnings": self.index_warnings,
+        }
+
+state = StartupState()
+
+
+class _Phase:
+    def __init__(self, name: str):
+        self.name = name
+
+    async def __aenter__(self):
+        self.start = time.perf_counter()
+
+    async def __aexit__(self, *exc):
+        state.phase_ms[self.name] = round((time.perf_counter() - self.start) * 1000, 2)
+
+
+async def _prewarm_postgres():
+    # Hold several connections at once so the pool actually grows to that size
+    async def ping():
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    await asyncio.gather(*(ping() for _ in range(PREWARM_CONNECTIONS)))
+
+
+async def _check_indexes():
+    warnings = []
+    db = get_mongo_client().bioof_nosql
+    for collection, expected in EXPECTED_MONGO_INDEXES.items():
+        info = await db[collection].index_information()
+        present = [list(map(tuple, idx["key"])) for idx in info.values()]
+        for key in expected:
+            if key not in present:
+                warnings.append(f"MongoDB {collection}: missing index {key}")
+
+    async with get_session_factory()() as session:
+        result = await session.execute(text("SELECT indexname FROM pg_indexes WHERE schemaname = 'public'"))
+        present = {row[0] for row in result.fetchall()}
+    for name in EXPECTED_SQL_INDEXES:
+        if name not in present:
+            warnings.append(f"PostgreSQL: missing index {name}")
+    state.index_warnings = warnings
+    state.index_checked_at = time.monotonic()
+
+
+async def recheck_indexes():
+    """Refreshes stale 'missing index' warnings; failures keep the old ones."""
+    if not state.ready or not state.index_warnings:
+        return
+    if time.monotonic() - state.index_checked_at < INDEX_RECHECK_SECONDS:
+        return
+    state.index_checked_at = time.monotonic()
+    try:
+        await _check_indexes()
+    except Exception:
+        pass
+
+
+async def _load_schema_registry():
+    async with get_session_factory()() as session:
+        await schema_registry.load(session)
+
+
+async def warmup():
+    """Opens connections and fills hot caches; retries until every step succeeds."""
+    while not state.ready:
+        state.warmup_attempts += 1
+        try:
+            async with _Phase("postgres_prewarm"):
+                await _prewarm_postgres()
+            async with _Phase("mongo_prewarm"):
+                await get_mongo_client().admin.command("ping")
+            async with _Phase("redis_prewarm"):
+                await get_redis_client().ping()
+            async with _Phase("schema_registry"):
+                await _load_schema_registry()
+            async with _Phase("index_checks"):
+                await _check_indexes()
+        except Exception as e:
+            state.last_error = f"{type(e).__name__}: {e}"
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+            continue
+        state.last_error = None
+        state.phase_ms["time_to_ready"] = round((time.perf_counter() - BOOT_STARTED) * 1000, 2)
+        state.ready = True
+        # Boot imports are recorded; stop routing every later import through the timer
+        uninstall_import_timer()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Builds clients once, then warms up in the background so /health/live
+    answers immediately while /health/ready stays 503 until warm.
+    """
+    async with _Phase("init_clients"):
+        init_clients()
+    task = asyncio.create_task(warmup())
+    try:
+        yield
+    finally:
+        state.ready = False
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await close_clients()